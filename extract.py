@@ -1,57 +1,236 @@
 import requests
 import json
+import asyncio
 import argparse
 import sys
 import re
 import time
-import random
+import contextlib
 import logging
-from typing import Optional, Dict, List
+import threading
+import atexit
+import hashlib
+import tempfile
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, List, Tuple, Iterator, Callable, Generator
 from urllib.parse import urlparse
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
 import os
-from dataclasses import dataclass
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
+from urllib3.exceptions import HTTPError as Urllib3HTTPError, ReadTimeoutError
 
+try:
+    import orjson
+    loads = orjson.loads
+except ImportError:
+    # Fallback to the standard library parser
+    orjson = None
+    from json import loads
 
-@dataclass
-class ReviewData:
-    """Data class for review information."""
-    user: Optional[str]
-    published_at: Optional[str]
-    source: Optional[str]
-    rating: Optional[int]
-    content: Optional[str]
+try:
+    import brotli  # noqa: F401 - enables urllib3 to decode "br" responses
+    ACCEPT_ENCODING = "gzip, deflate, br"
+except ImportError:
+    ACCEPT_ENCODING = "gzip, deflate"
+
+try:
+    import aiohttp
+except ImportError:
+    # Async scraping is optional
+    aiohttp = None
+
+try:
+    import httpx
+except ImportError:
+    # HTTP/2 transport is optional
+    httpx = None
+
+# Transport errors of whichever HTTP client is in use; urllib3 errors surface
+# unwrapped when a streamed body is read from response.raw
+_TIMEOUT_ERRORS = (requests.exceptions.Timeout, ReadTimeoutError) + ((httpx.TimeoutException,) if httpx else ())
+_REQUEST_ERRORS = (requests.exceptions.RequestException, Urllib3HTTPError) + ((httpx.HTTPError,) if httpx else ())
+
+# Accepted Google Maps URL prefixes
+_ALLOWED_URL_PREFIXES = ("https://maps.google.com/", "https://www.google.com/")
+_ALLOWED_HOSTS = ("maps.google.com", "www.google.com")
+
+# Shared by the file and console log handlers
+_LOG_FORMATTER = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+
+# Status codes that signal the server wants us to slow down
+THROTTLE_STATUSES = (429, 503)
+
+# Business identifier patterns, e.g. "1s0x47e6721b7d55567d:0xaa8fe344e1e346b3"
+_BID_PRIMARY = re.compile(r'1s(0x[a-f0-9]+:0x[a-f0-9]+)')
+_BID_FALLBACK = re.compile(r'0x[a-f0-9]+:0x[a-f0-9]+')
+
+# Maximum number of place URLs whose reviews URL parts are cached per scraper
+_URL_PARTS_CACHE_SIZE = 64
+
+# Reviews API "pb" parameter pieces: (before business ID, before pagination token, after token)
+_REVIEWS_URL_BASE = "https://www.google.com/maps/rpc/listugcposts?authuser=0&hl=en&gl=us&pb="
+# Use the TripAdvisor filter you discovered
+_PB_TRIPADVISOR = (
+    "!1m7!1s",
+    "!6m4!4m1!1e1!4m1!1e3!13i100532569!2m2!1i10!2s",
+    "!5m2!1sxkx7aMKiOLKshbIPoZm1sAk!7e81!8m9!2b1!3b1!5b1!7b1!12m4!1b1!2b1!4m1!1e1!11m0!13m1!1e1",
+)
+# Original format without filter
+_PB_STANDARD = (
+    "!1m6!1s",
+    "!6m4!4m1!1e1!4m1!1e3!2m2!1i10!2s",
+    "!5m2!1sxkx7aMKiOLKshbIPoZm1sAk!7e81!8m9!2b1!3b1!5b1!7b1!12m4!1b1!2b1!4m1!1e1!11m0!13m1!1e1",
+)
+
+# Debug responses are written in the background so scraping is not blocked on disk I/O;
+# one writer is shared by all scraper instances
+_DEBUG_POOL = ThreadPoolExecutor(max_workers=1, thread_name_prefix="debug-writer")
+atexit.register(_DEBUG_POOL.shutdown, wait=True)
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Convert a Retry-After header (seconds or HTTP date) into a delay in seconds."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket whose refill rate adapts to server feedback.
+    
+    The rate grows additively after successful responses and shrinks
+    multiplicatively when the server throttles (AIMD), staying within
+    [min_rate, max_rate] requests per second.
+    """
+    
+    def __init__(self, rate=1.0, burst=4, min_rate=None, max_rate=None, increase=0.05, decrease=0.5):
+        """
+        Args:
+            rate: Initial refill rate in requests per second
+            burst: Maximum number of tokens that can accumulate
+            min_rate: Lowest rate reached by backing off (defaults to rate)
+            max_rate: Highest rate reached by speeding up (defaults to rate)
+            increase: Rate added after each successful response
+            decrease: Factor applied to the rate when throttled
+        """
+        self.rate = rate
+        self.burst = burst
+        self.min_rate = min_rate if min_rate is not None else rate
+        self.max_rate = max_rate if max_rate is not None else rate
+        self.increase = increase
+        self.decrease = decrease
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+    
+    def _refill(self, now: float):
+        """Add the tokens earned since the last update."""
+        elapsed = now - self._updated
+        if elapsed > 0:
+            self._tokens = min(self.burst, self._tokens + elapsed * self.rate)
+        self._updated = now
+    
+    def reserve(self, tokens: float = 1) -> float:
+        """Take tokens and return how many seconds the caller must wait before using them."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens -= tokens
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            return max(wait, self._blocked_until - now)
+    
+    def consume(self, tokens: float = 1) -> float:
+        """Block until tokens are available; returns the time waited."""
+        wait = self.reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+    
+    def on_success(self):
+        """Additively increase the rate after a successful response."""
+        with self._lock:
+            self._refill(time.monotonic())
+            self.rate = min(self.max_rate, self.rate + self.increase)
+    
+    def on_throttle(self, retry_after: Optional[float] = None):
+        """Multiplicatively decrease the rate and pause for Retry-After seconds if given."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.rate = max(self.min_rate, self.rate * self.decrease)
+            if retry_after:
+                self._blocked_until = max(self._blocked_until, now + retry_after)
 
 
 class GoogleMapsReviewScraper:
     """Professional Google Maps review scraper with rate limiting and error handling."""
     
-    def __init__(self, delay_range=(1, 3), max_retries=3, timeout=10):
+    def __init__(self, delay_range=(1, 3), max_retries=3, timeout=10, http2=False,
+                 page_cache_size=0, cache_dir=None):
         """
         Initialize the scraper with configuration options.
         
         Args:
-            delay_range: Tuple of min and max delay between requests (seconds)
+            delay_range: Tuple of min and max delay between requests (seconds); the adaptive
+                rate limiter starts at the mean delay and moves within this range
             max_retries: Maximum number of retry attempts for failed requests
             timeout: Request timeout in seconds
+            http2: If True, send requests over a multiplexed HTTP/2 connection using httpx
+            page_cache_size: Number of raw review pages kept in memory for repeated scrapes of the
+                same URLs within one process (default 0, disabled)
+            cache_dir: Optional directory where raw review pages are cached across runs
         """
         self.delay_range = delay_range
         self.max_retries = max_retries
         self.timeout = timeout
+        self.http2 = http2
         self.session = self._create_session()
+        # httpx client used for review requests when HTTP/2 is enabled
+        self._http2_client = self._create_http2_client() if http2 else None
         self.logger = self._setup_logging()
+        # Reviews URL (prefix, suffix) per (place URL, TripAdvisor filter), most recently used last
+        self._url_parts_cache = OrderedDict()
+        self._url_parts_lock = threading.Lock()
+        self.rate_limiter = TokenBucket(
+            rate=self._delay_to_rate(sum(delay_range) / 2),
+            burst=4,
+            min_rate=self._delay_to_rate(max(delay_range)),
+            max_rate=self._delay_to_rate(min(delay_range))
+        )
+        # Raw page bodies keyed by reviews URL, most recently used last
+        self.page_cache_size = page_cache_size
+        self.cache_dir = cache_dir
+        self._page_cache = OrderedDict()
+        self._page_cache_lock = threading.Lock()
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
         
     def _setup_logging(self) -> logging.Logger:
-        """Setup logging configuration."""
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.FileHandler('scraper.log'),
-                logging.StreamHandler(sys.stdout)
-            ]
-        )
+        """Setup logging configuration once, shared by all scraper instances."""
+        root = logging.getLogger()
+        # basicConfig is a no-op once handlers exist, but building the handlers
+        # would still open scraper.log again for every new instance
+        if not root.handlers:
+            file_handler = logging.FileHandler('scraper.log')
+            stream_handler = logging.StreamHandler(sys.stdout)
+            file_handler.setFormatter(_LOG_FORMATTER)
+            stream_handler.setFormatter(_LOG_FORMATTER)
+            logging.basicConfig(level=logging.INFO, handlers=[file_handler, stream_handler])
         return logging.getLogger(__name__)
     
     def _create_session(self) -> requests.Session:
@@ -62,17 +241,29 @@ class GoogleMapsReviewScraper:
         retry_kwargs = {
             'total': self.max_retries,
             'status_forcelist': [429, 500, 502, 503, 504],
-            'backoff_factor': 1
+            'backoff_factor': 1,
+            # Return the last response instead of raising so the rate limiter sees it
+            'raise_on_status': False,
+            'respect_retry_after_header': True
+        }
+        # Jittered, capped backoff keeps parallel workers from retrying in lockstep (urllib3 >= 2)
+        backoff_kwargs = {
+            'backoff_jitter': 0.5,
+            'backoff_max': 30
         }
         
         # Handle compatibility between urllib3 versions
         try:
-            retry_strategy = Retry(allowed_methods=["HEAD", "GET", "OPTIONS"], **retry_kwargs)
+            retry_strategy = Retry(allowed_methods=["HEAD", "GET", "OPTIONS"], **retry_kwargs, **backoff_kwargs)
         except TypeError:
-            # Fallback for older urllib3 versions
-            retry_strategy = Retry(method_whitelist=["HEAD", "GET", "OPTIONS"], **retry_kwargs)
+            try:
+                retry_strategy = Retry(allowed_methods=["HEAD", "GET", "OPTIONS"], **retry_kwargs)
+            except TypeError:
+                # Fallback for older urllib3 versions
+                retry_strategy = Retry(method_whitelist=["HEAD", "GET", "OPTIONS"], **retry_kwargs)
         
-        adapter = HTTPAdapter(max_retries=retry_strategy)
+        # Larger pool so back-to-back requests to the same host reuse warm connections
+        adapter = HTTPAdapter(pool_connections=32, pool_maxsize=32, max_retries=retry_strategy)
         session.mount("http://", adapter)
         session.mount("https://", adapter)
         
@@ -81,44 +272,98 @@ class GoogleMapsReviewScraper:
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
             "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
             "Accept-Language": "en-US,en;q=0.5",
-            "Accept-Encoding": "gzip, deflate",
+            "Accept-Encoding": ACCEPT_ENCODING,
             "DNT": "1",
             "Connection": "keep-alive",
+            "Keep-Alive": "timeout=85, max=1000",
             "Upgrade-Insecure-Requests": "1"
         })
         
         return session
     
+    def _create_http2_client(self) -> "httpx.Client":
+        """Create an httpx client that multiplexes requests over HTTP/2."""
+        if httpx is None:
+            raise RuntimeError("httpx is required for HTTP/2 support (pip install 'httpx[http2]')")
+        
+        # Connection-specific headers are not allowed in HTTP/2
+        headers = {name: value for name, value in self.session.headers.items()
+                   if name.lower() not in ("connection", "keep-alive")}
+        
+        return httpx.Client(
+            http2=True,
+            timeout=self.timeout,
+            headers=headers,
+            follow_redirects=True,
+            transport=httpx.HTTPTransport(http2=True, retries=self.max_retries)
+        )
+    
+    def close(self):
+        """Close the HTTP clients and their pooled connections."""
+        if self._http2_client is not None:
+            self._http2_client.close()
+        self.session.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
     def _validate_url(self, url: str) -> bool:
         """Validate if the URL is a proper Google Maps URL."""
-        try:
-            parsed = urlparse(url)
-            if parsed.netloc not in ['maps.google.com', 'www.google.com']:
-                self.logger.error(f"Invalid domain: {parsed.netloc}")
-                return False
+        if url.startswith(_ALLOWED_URL_PREFIXES):
             return True
+        
+        message = f"Invalid URL: must start with one of {', '.join(_ALLOWED_URL_PREFIXES)}"
+        # Only parse the URL to report a domain that is not allowed
+        try:
+            netloc = urlparse(url).netloc
         except Exception as e:
             self.logger.error(f"URL validation error: {e}")
             return False
+        if netloc not in _ALLOWED_HOSTS:
+            message += f" (got domain: {netloc or 'none'})"
+        self.logger.error(message)
+        return False
+    
+    @staticmethod
+    def _delay_to_rate(delay: float) -> float:
+        """Convert a delay between requests into a rate in requests per second."""
+        return 1.0 / delay if delay > 0 else float("inf")
     
     def _respect_rate_limit(self):
-        """Implement random delay to respect rate limits."""
-        delay = random.uniform(*self.delay_range)
-        self.logger.debug(f"Waiting {delay:.2f} seconds...")
-        time.sleep(delay)
+        """Wait for the adaptive rate limiter before sending a request."""
+        delay = self.rate_limiter.consume()
+        if delay > 0:
+            self.logger.debug(f"Waited {delay:.2f} seconds (rate {self.rate_limiter.rate:.2f} req/s)")
+    
+    def _update_rate_limit(self, status_code: int, headers, retry_history=()):
+        """Feed a response status back into the rate limiter."""
+        # Throttling absorbed by urllib3's own retries only shows up in the retry history
+        throttled = (status_code in THROTTLE_STATUSES
+                     or any(h.status in THROTTLE_STATUSES for h in retry_history))
+        
+        if throttled:
+            retry_after = _parse_retry_after(headers.get("Retry-After"))
+            self.rate_limiter.on_throttle(retry_after)
+            self.logger.warning(f"Throttled by server, slowing down to {self.rate_limiter.rate:.2f} req/s"
+                                + (f" and pausing {retry_after:.0f} seconds" if retry_after else ""))
+        elif status_code < 400:
+            self.rate_limiter.on_success()
     
     def _extract_business_id(self, place_url: str) -> Optional[str]:
         """Extract business ID from Google Maps URL."""
         try:
             # First pattern
-            match = re.search(r'1s(0x[a-f0-9]+:0x[a-f0-9]+)', place_url)
+            match = _BID_PRIMARY.search(place_url)
             if match:
                 return match.group(1)
             
             # Fallback pattern
-            matches = re.findall(r'(0x[a-f0-9]+:0x[a-f0-9]+)', place_url)
-            if matches:
-                return matches[0]
+            match = _BID_FALLBACK.search(place_url)
+            if match:
+                return match.group(0)
             
             self.logger.error("Could not extract business identifier from URL")
             return None
@@ -127,8 +372,35 @@ class GoogleMapsReviewScraper:
             self.logger.error(f"Error extracting business ID: {e}")
             return None
     
-    def _generate_reviews_url(self, place_url: str, pagination_token: str = "", tripadvisor_filter: bool = False) -> Optional[str]:
-        """Generate the reviews API URL with optional TripAdvisor filter."""
+    def _url_parts(self, place_url: str, tripadvisor_filter: bool = False) -> Optional[Tuple[str, str]]:
+        """
+        Build the reviews API URL for a place, split around the pagination token.
+        
+        Validation and business ID extraction only depend on the place URL, so
+        valid results are cached on the instance and reused for every page of a scrape.
+        
+        Returns:
+            Tuple of (prefix, suffix) to join with a pagination token, or None if the URL is invalid
+        """
+        key = (place_url, tripadvisor_filter)
+        with self._url_parts_lock:
+            url_parts = self._url_parts_cache.get(key)
+            if url_parts is not None:
+                self._url_parts_cache.move_to_end(key)
+                return url_parts
+        
+        url_parts = self._build_url_parts(place_url, tripadvisor_filter)
+        # Invalid URLs are not cached so every attempt logs why it was rejected
+        if url_parts is not None:
+            with self._url_parts_lock:
+                self._url_parts_cache[key] = url_parts
+                self._url_parts_cache.move_to_end(key)
+                while len(self._url_parts_cache) > _URL_PARTS_CACHE_SIZE:
+                    self._url_parts_cache.popitem(last=False)
+        return url_parts
+    
+    def _build_url_parts(self, place_url: str, tripadvisor_filter: bool) -> Optional[Tuple[str, str]]:
+        """Validate a place URL and build its (prefix, suffix) reviews URL parts."""
         if not self._validate_url(place_url):
             return None
             
@@ -137,105 +409,241 @@ class GoogleMapsReviewScraper:
             return None
         
         if tripadvisor_filter:
-            # Use the TripAdvisor filter you discovered
-            pb_param = (f"!1m7!1s{business_id}!6m4!4m1!1e1!4m1!1e3!13i100532569!"
-                       f"2m2!1i10!2s{pagination_token}!5m2!1sxkx7aMKiOLKshbIPoZm1sAk!7e81!"
-                       f"8m9!2b1!3b1!5b1!7b1!12m4!1b1!2b1!4m1!1e1!11m0!13m1!1e1")
+            template = _PB_TRIPADVISOR
             self.logger.debug("Using TripAdvisor server-side filter")
         else:
-            # Original format without filter
-            pb_param = (f"!1m6!1s{business_id}!6m4!4m1!1e1!4m1!1e3!2m2!1i10!2s{pagination_token}!"
-                       f"5m2!1sxkx7aMKiOLKshbIPoZm1sAk!7e81!8m9!2b1!3b1!5b1!7b1!12m4!1b1!2b1!4m1!1e1!11m0!13m1!1e1")
+            template = _PB_STANDARD
         
-        return f"https://www.google.com/maps/rpc/listugcposts?authuser=0&hl=en&gl=us&pb={pb_param}"
+        return "".join((_REVIEWS_URL_BASE, template[0], business_id, template[1])), template[2]
     
-    def _clean_response_text(self, response_text: str) -> str:
-        """Clean the response text by removing the security prefix."""
-        prefixes = [")]}'\n", ")]}':"]
-        for prefix in prefixes:
-            if response_text.startswith(prefix):
-                return response_text[len(prefix):]
-        return response_text
+    def _clean_response_bytes(self, response_body: bytes) -> bytes:
+        """Clean the raw response body by removing the security prefix."""
+        if response_body[:5] == b")]}'\n":
+            return response_body[5:]
+        if response_body[:5] == b")]}':":
+            return response_body[5:]
+        return response_body
     
-    def _scrape_reviews_batch(self, reviews_url: str) -> Optional[List]:
-        """Scrape a single batch of reviews."""
-        self._respect_rate_limit()
+    def _parse_reviews_response(self, response_body: bytes, save_debug: bool = True) -> Optional[List]:
+        """Parse a raw reviews response, saving it for debugging if it is not valid JSON."""
+        # Parse the undecoded bytes; both orjson and json accept UTF-8 input directly
+        cleaned_body = self._clean_response_bytes(response_body)
         
         try:
-            response = self.session.get(reviews_url, timeout=self.timeout)
+            data = loads(cleaned_body)
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug(f"Successfully parsed response with {len(data[2]) if data and len(data) > 2 and data[2] else 0} reviews")
+            return data
+        except json.JSONDecodeError as e:
+            self.logger.error(f"Failed to parse JSON response: {e}")
+            if save_debug:
+                _DEBUG_POOL.submit(self._save_debug_response, response_body)
+            return None
+    
+    @staticmethod
+    def _has_reviews(data) -> bool:
+        """Check whether a parsed response is a page holding reviews."""
+        return isinstance(data, list) and len(data) > 2 and bool(data[2])
+    
+    def _fetch_page(self, reviews_url: str) -> bytes:
+        """Fetch the raw body of a reviews page, raising on transport or HTTP errors."""
+        if self.http2:
+            response = self._http2_client.get(reviews_url, timeout=self.timeout)
+            self._update_rate_limit(response.status_code, response.headers)
             response.raise_for_status()
-            
-            cleaned_text = self._clean_response_text(response.text)
-            
+            return response.content
+        
+        # Stream and read the decoded body from urllib3 in one call instead of
+        # letting requests assemble response.content from small chunks
+        with self.session.get(reviews_url, timeout=self.timeout, stream=True) as response:
+            retries = response.raw.retries
+            self._update_rate_limit(response.status_code, response.headers, retries.history if retries else ())
+            response.raise_for_status()
+            return response.raw.read(decode_content=True)
+    
+    def _cache_path(self, reviews_url: str) -> str:
+        """Path of the on-disk cache file for a reviews URL."""
+        key = hashlib.blake2b(reviews_url.encode("utf-8"), digest_size=16).hexdigest()
+        return os.path.join(self.cache_dir, f"{key}.bin")
+    
+    def _cache_get(self, reviews_url: str) -> Optional[bytes]:
+        """Return the cached raw body of a reviews page, if any."""
+        with self._page_cache_lock:
+            body = self._page_cache.get(reviews_url)
+            if body is not None:
+                self._page_cache.move_to_end(reviews_url)
+                return body
+        
+        if self.cache_dir:
             try:
-                data = json.loads(cleaned_text)
-                self.logger.debug(f"Successfully parsed response with {len(data[2]) if data and len(data) > 2 and data[2] else 0} reviews")
-                return data
-            except json.JSONDecodeError as e:
-                self.logger.error(f"Failed to parse JSON response: {e}")
-                self._save_debug_response(response.text)
+                with open(self._cache_path(reviews_url), "rb") as f:
+                    body = f.read()
+            except FileNotFoundError:
+                return None
+            except OSError as e:
+                self.logger.warning(f"Failed to read cached response: {e}")
                 return None
+            self._remember_page(reviews_url, body)
+        return body
+    
+    def _remember_page(self, reviews_url: str, body: bytes):
+        """Store a raw body in the in-memory LRU cache."""
+        if self.page_cache_size <= 0:
+            return
+        with self._page_cache_lock:
+            self._page_cache[reviews_url] = body
+            self._page_cache.move_to_end(reviews_url)
+            while len(self._page_cache) > self.page_cache_size:
+                self._page_cache.popitem(last=False)
+    
+    def _cache_put(self, reviews_url: str, body: bytes):
+        """Cache the raw body of a reviews page."""
+        self._remember_page(reviews_url, body)
+        if self.cache_dir:
+            # Write to a temporary file and rename it so an interrupted write
+            # never leaves a truncated cache entry behind
+            try:
+                fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+                try:
+                    with os.fdopen(fd, "wb") as f:
+                        f.write(body)
+                    os.replace(tmp_path, self._cache_path(reviews_url))
+                except BaseException:
+                    os.unlink(tmp_path)
+                    raise
+            except OSError as e:
+                self.logger.warning(f"Failed to write cached response: {e}")
+    
+    def _cache_discard(self, reviews_url: str):
+        """Drop a reviews page from the memory and disk caches."""
+        with self._page_cache_lock:
+            self._page_cache.pop(reviews_url, None)
+        if self.cache_dir:
+            try:
+                os.remove(self._cache_path(reviews_url))
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                self.logger.warning(f"Failed to remove cached response: {e}")
+    
+    def _load_cached_page(self, reviews_url: str) -> Optional[List]:
+        """Return the parsed cached page, discarding entries that are no longer usable."""
+        cached_body = self._cache_get(reviews_url)
+        if cached_body is None:
+            return None
+        
+        data = self._parse_reviews_response(cached_body, save_debug=False)
+        if not self._has_reviews(data):
+            self.logger.warning("Discarding invalid cached response")
+            self._cache_discard(reviews_url)
+            return None
+        
+        self.logger.debug("Using cached response")
+        return data
+    
+    def _parse_and_cache(self, reviews_url: str, body: bytes) -> Optional[List]:
+        """Parse a freshly fetched page and cache its body if it holds reviews."""
+        data = self._parse_reviews_response(body)
+        # Empty or soft-blocked pages are not cached, they would end pagination on every replay
+        if self._has_reviews(data):
+            self._cache_put(reviews_url, body)
+        return data
+    
+    def _scrape_reviews_batch(self, reviews_url: str) -> Optional[List]:
+        """Scrape a single batch of reviews."""
+        cached_data = self._load_cached_page(reviews_url)
+        if cached_data is not None:
+            return cached_data
+        
+        self._respect_rate_limit()
+        
+        try:
+            return self._parse_and_cache(reviews_url, self._fetch_page(reviews_url))
                 
-        except requests.exceptions.Timeout:
+        except _TIMEOUT_ERRORS:
             self.logger.warning("Request timeout - server may be slow")
             return None
-        except requests.exceptions.RequestException as e:
+        except _REQUEST_ERRORS as e:
             self.logger.error(f"Request failed: {e}")
             return None
         except Exception as e:
             self.logger.error(f"Unexpected error during request: {e}")
             return None
     
-    def _save_debug_response(self, response_text: str):
+    def _save_debug_response(self, response_body: bytes):
         """Save raw response for debugging purposes."""
         debug_file = f"debug_response_{int(time.time())}.txt"
         try:
-            with open(debug_file, "w", encoding="utf-8") as f:
-                f.write(response_text)
+            with open(debug_file, "wb") as f:
+                f.write(response_body)
             self.logger.info(f"Debug response saved to {debug_file}")
         except Exception as e:
             self.logger.error(f"Failed to save debug response: {e}")
     
-    def _extract_review_data(self, review: List) -> ReviewData:
-        """Extract review data from the raw response structure."""
+    def _extract_review_dict(self, review: List) -> Dict:
+        """Extract a review dictionary from the raw response structure."""
+        # Straight-line indexing; a missing level raises LookupError or TypeError.
+        # Containers right before the last subscript are checked not to be strings,
+        # which would otherwise yield single characters.
         try:
-            return ReviewData(
-                user=self._safe_extract(review, [0, 1, 4, 5, 0]),
-                published_at=self._safe_extract(review, [0, 1, 6]),
-                source=self._safe_extract(review, [0, 1, 13, -2]),
-                rating=self._safe_extract(review, [0, 1, 13, -1]),
-                content=self._safe_extract(review, [0, 2, 15, 0, 0])
-            )
-        except Exception as e:
-            self.logger.warning(f"Skipping malformed review: {e}")
-            return ReviewData(None, None, None, None, None)
-    
-    def _safe_extract(self, data, path):
-        """Safely extract nested data using a path list."""
+            meta = review[0][1]
+        except (LookupError, TypeError):
+            meta = None
         try:
-            current = data
-            for key in path:
-                if isinstance(current, list) and len(current) > abs(key):
-                    current = current[key]
-                elif isinstance(current, dict) and key in current:
-                    current = current[key]
-                else:
-                    return None
-            return current
-        except (IndexError, TypeError, KeyError):
-            return None
+            names = meta[4][5]
+            user = None if isinstance(names, str) else names[0]
+        except (LookupError, TypeError):
+            user = None
+        try:
+            published_at = None if isinstance(meta, str) else meta[6]
+        except (LookupError, TypeError):
+            published_at = None
+        try:
+            origin = meta[13]
+            if isinstance(origin, str):
+                source = rating = None
+            else:
+                # Same length requirements as the original path walker
+                source = origin[-2] if len(origin) > 2 else None
+                rating = origin[-1] if len(origin) > 1 else None
+        except (LookupError, TypeError):
+            source = rating = None
+        try:
+            text = review[0][2][15][0]
+            content = None if isinstance(text, str) else text[0]
+        except (LookupError, TypeError):
+            content = None
+        
+        return {
+            "user": user,
+            "published_at": published_at,
+            "source": source,
+            "rating": rating,
+            "content": content
+        }
+    
+    def _iter_page_reviews(self, data: List, tripadvisor_only: bool = False) -> Iterator[Dict]:
+        """Yield review dictionaries for the raw reviews of a single page."""
+        for raw_review in data[2]:
+            review_dict = self._extract_review_dict(raw_review)
+            
+            # When using server-side filter, we shouldn't need client-side filtering
+            # but keep it as a safety check
+            source = review_dict.get("source")
+            if tripadvisor_only and source and source.lower() != "tripadvisor":
+                self.logger.debug(f"Unexpected non-TripAdvisor review found: {source}")
+                continue
+            
+            yield review_dict
     
-    def scrape_all_reviews(self, place_url: str, tripadvisor_only: bool = False, max_pages: int = None) -> List[Dict]:
+    def _paginate(self, place_url: str, tripadvisor_only: bool = False, max_pages: int = None,
+                  sink: Optional[Callable[[Dict], None]] = None) -> Generator[str, Optional[List], List[Dict]]:
         """
-        Scrape all reviews from a Google Maps location.
+        Walk the review pages of one location, independently of how pages are fetched.
         
-        Args:
-            place_url: Google Maps URL of the business
-            tripadvisor_only: If True, only extract TripAdvisor reviews using server-side filtering
-            max_pages: Maximum number of pages to scrape (None for unlimited)
-        
-        Returns:
-            List of review dictionaries
+        Yields the reviews URL of each page and expects the parsed response (or
+        None) to be sent back; returns the collected reviews when done. The sync
+        and async scrapers only differ in how they fetch the yielded URLs.
         """
         self.logger.info(f"Starting review scraping for URL: {place_url}")
         if tripadvisor_only:
@@ -244,42 +652,31 @@ class GoogleMapsReviewScraper:
         all_reviews = []
         pagination_token = ""
         page_count = 0
+        total_reviews = 0
+        
+        url_parts = self._url_parts(place_url, tripadvisor_only)
+        prefix, suffix = url_parts if url_parts else ("", "")
         
-        while True:
+        while url_parts:
             if max_pages and page_count >= max_pages:
                 self.logger.info(f"Reached maximum page limit: {max_pages}")
                 break
                 
-            reviews_url = self._generate_reviews_url(place_url, pagination_token, tripadvisor_only)
-            if not reviews_url:
-                break
+            reviews_url = f"{prefix}{pagination_token}{suffix}"
             
-            data = self._scrape_reviews_batch(reviews_url)
-            if not data or len(data) < 3 or not data[2]:
+            data = yield reviews_url
+            if not self._has_reviews(data):
                 self.logger.info("No more reviews found or invalid response")
                 break
             
-            page_reviews = 0            
-            for raw_review in data[2]:
-                review_data = self._extract_review_data(raw_review)
-                
-                # When using server-side filter, we shouldn't need client-side filtering
-                # but keep it as a safety check
-                if tripadvisor_only and review_data.source and review_data.source.lower() != "tripadvisor":
-                    self.logger.debug(f"Unexpected non-TripAdvisor review found: {review_data.source}")
-                    continue
-                
-                # Convert to dictionary for JSON serialization
-                review_dict = {
-                    "user": review_data.user,
-                    "published_at": review_data.published_at,
-                    "source": review_data.source,
-                    "rating": review_data.rating,
-                    "content": review_data.content
-                }
-                
-                all_reviews.append(review_dict)
+            page_reviews = 0
+            for review_dict in self._iter_page_reviews(data, tripadvisor_only):
+                if sink is not None:
+                    sink(review_dict)
+                else:
+                    all_reviews.append(review_dict)
                 page_reviews += 1
+            total_reviews += page_reviews
             
             self.logger.info(f"Page {page_count + 1}: Collected {page_reviews} reviews")
             
@@ -291,25 +688,188 @@ class GoogleMapsReviewScraper:
             
             page_count += 1
         
-        self.logger.info(f"Scraping completed. Total reviews collected: {len(all_reviews)}")
-        if tripadvisor_only and len(all_reviews) == 0:
+        self.logger.info(f"Scraping completed. Total reviews collected: {total_reviews}")
+        if tripadvisor_only and total_reviews == 0:
             self.logger.warning("No TripAdvisor reviews found for this location. The business might not have TripAdvisor integration.")
         
         return all_reviews
     
+    def scrape_all_reviews(self, place_url: str, tripadvisor_only: bool = False, max_pages: int = None,
+                           sink: Optional[Callable[[Dict], None]] = None) -> List[Dict]:
+        """
+        Scrape all reviews from a Google Maps location.
+        
+        Args:
+            place_url: Google Maps URL of the business
+            tripadvisor_only: If True, only extract TripAdvisor reviews using server-side filtering
+            max_pages: Maximum number of pages to scrape (None for unlimited)
+            sink: Optional callable receiving each review as it is scraped; when given,
+                reviews are not accumulated in memory
+        
+        Returns:
+            List of review dictionaries (empty when a sink is used)
+        """
+        pages = self._paginate(place_url, tripadvisor_only, max_pages, sink)
+        try:
+            reviews_url = next(pages)
+            while True:
+                reviews_url = pages.send(self._scrape_reviews_batch(reviews_url))
+        except StopIteration as done:
+            return done.value
+    
+    def scrape_many(self, place_urls: List[str], workers: int = 16, tripadvisor_only: bool = False,
+                    max_pages: int = None) -> Dict[str, List[Dict]]:
+        """
+        Scrape reviews from several Google Maps locations in parallel threads.
+        
+        Args:
+            place_urls: Google Maps URLs of the businesses
+            workers: Maximum number of locations scraped at the same time
+            tripadvisor_only: If True, only extract TripAdvisor reviews using server-side filtering
+            max_pages: Maximum number of pages to scrape per location (None for unlimited)
+        
+        Returns:
+            Dictionary mapping each URL to its list of review dictionaries
+        """
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = executor.map(
+                lambda place_url: self.scrape_all_reviews(place_url, tripadvisor_only, max_pages),
+                place_urls
+            )
+            return dict(zip(place_urls, results))
+    
+    async def _scrape_reviews_batch_async(self, session: "aiohttp.ClientSession", semaphore: asyncio.Semaphore,
+                                          reviews_url: str) -> Optional[List]:
+        """Scrape a single batch of reviews without blocking the event loop."""
+        # Disk cache lookups and writes are kept off the event loop; the
+        # in-memory cache is cheap enough to use directly
+        if self.cache_dir:
+            cached_data = await asyncio.to_thread(self._load_cached_page, reviews_url)
+        elif self.page_cache_size > 0:
+            cached_data = self._load_cached_page(reviews_url)
+        else:
+            cached_data = None
+        if cached_data is not None:
+            return cached_data
+        
+        delay = self.rate_limiter.reserve()
+        if delay > 0:
+            self.logger.debug(f"Waiting {delay:.2f} seconds (rate {self.rate_limiter.rate:.2f} req/s)")
+            await asyncio.sleep(delay)
+        
+        try:
+            async with semaphore:
+                async with session.get(reviews_url, timeout=aiohttp.ClientTimeout(total=self.timeout)) as response:
+                    self._update_rate_limit(response.status, response.headers)
+                    response.raise_for_status()
+                    response_body = await response.read()
+            if self.cache_dir:
+                return await asyncio.to_thread(self._parse_and_cache, reviews_url, response_body)
+            return self._parse_and_cache(reviews_url, response_body)
+                
+        except asyncio.TimeoutError:
+            self.logger.warning("Request timeout - server may be slow")
+            return None
+        except aiohttp.ClientError as e:
+            self.logger.error(f"Request failed: {e}")
+            return None
+        except Exception as e:
+            self.logger.error(f"Unexpected error during request: {e}")
+            return None
+    
+    async def _scrape_place_async(self, session: "aiohttp.ClientSession", semaphore: asyncio.Semaphore,
+                                  place_url: str, tripadvisor_only: bool = False, max_pages: int = None,
+                                  sink: Optional[Callable[[Dict], None]] = None) -> List[Dict]:
+        """Scrape all review pages of a single location on a shared aiohttp session."""
+        pages = self._paginate(place_url, tripadvisor_only, max_pages, sink)
+        try:
+            reviews_url = next(pages)
+            while True:
+                reviews_url = pages.send(await self._scrape_reviews_batch_async(session, semaphore, reviews_url))
+        except StopIteration as done:
+            return done.value
+    
+    async def scrape_all_reviews_async(self, place_urls: List[str], tripadvisor_only: bool = False,
+                                       max_pages: int = None,
+                                       sink: Optional[Callable[[Dict], None]] = None) -> Dict[str, List[Dict]]:
+        """
+        Scrape reviews from several Google Maps locations concurrently.
+        
+        Pages of a single location are still fetched one after another, since
+        every page carries the token for the next one; different locations
+        share one keep-alive connection pool and overlap their requests.
+        
+        Args:
+            place_urls: Google Maps URLs of the businesses
+            tripadvisor_only: If True, only extract TripAdvisor reviews using server-side filtering
+            max_pages: Maximum number of pages to scrape per location (None for unlimited)
+            sink: Optional callable receiving each review as it is scraped; when given,
+                reviews are not accumulated in memory
+        
+        Returns:
+            Dictionary mapping each URL to its list of review dictionaries (empty lists when a sink is used)
+        """
+        if aiohttp is None:
+            raise RuntimeError("aiohttp is required for async scraping (pip install aiohttp)")
+        
+        connector = aiohttp.TCPConnector(limit_per_host=64, keepalive_timeout=85)
+        semaphore = asyncio.Semaphore(64)
+        async with aiohttp.ClientSession(connector=connector, headers=dict(self.session.headers)) as session:
+            results = await asyncio.gather(*(
+                self._scrape_place_async(session, semaphore, place_url, tripadvisor_only, max_pages, sink)
+                for place_url in place_urls
+            ))
+        
+        return dict(zip(place_urls, results))
+    
     def save_reviews(self, reviews: List[Dict], filename: str = "reviews.json"):
         """Save reviews to a JSON file."""
         try:
             # Ensure directory exists
             os.makedirs(os.path.dirname(filename) if os.path.dirname(filename) else '.', exist_ok=True)
             
-            with open(filename, "w", encoding="utf-8") as f:
-                json.dump(reviews, f, ensure_ascii=False, indent=2)
+            # Serialize everything up front and write it with a single call
+            if orjson is not None:
+                data = orjson.dumps(
+                    reviews,
+                    option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE
+                )
+            else:
+                data = (json.dumps(reviews, ensure_ascii=False, indent=2) + "\n").encode("utf-8")
+            
+            with open(filename, "wb") as f:
+                f.write(data)
             
             self.logger.info(f"✅ Saved {len(reviews)} reviews to {filename}")
         except Exception as e:
             self.logger.error(f"Failed to save reviews: {e}")
             raise
+    
+    @contextlib.contextmanager
+    def save_reviews_stream(self, filename: str = "reviews.jsonl") -> Iterator[Callable[[Dict], None]]:
+        """
+        Open a JSON Lines file and yield a callable that appends one review per line.
+        
+        Intended as the ``sink`` of scrape_all_reviews, so reviews are written
+        as they arrive instead of being held in memory until the end.
+        """
+        # Ensure directory exists
+        os.makedirs(os.path.dirname(filename) if os.path.dirname(filename) else '.', exist_ok=True)
+        
+        saved = 0
+        with open(filename, "wb") as f:
+            def write_review(review: Dict):
+                nonlocal saved
+                if orjson is not None:
+                    f.write(orjson.dumps(review))
+                else:
+                    f.write(json.dumps(review, ensure_ascii=False).encode("utf-8"))
+                f.write(b"\n")
+                saved += 1
+            
+            yield write_review
+        
+        self.logger.info(f"✅ Saved {saved} reviews to {filename}")
 
 
 def main():
@@ -321,36 +881,53 @@ def main():
     parser.add_argument('--tripadvisor', action='store_true', 
                        help="Extract only TripAdvisor reviews")
     parser.add_argument('--output', '-o', default="reviews.json", 
-                       help="Output filename (default: reviews.json)")
+                       help="Output filename (default: reviews.json); a .jsonl file is written "
+                            "incrementally, one review per line")
     parser.add_argument('--delay', type=float, nargs=2, default=[1, 3], 
                        metavar=('MIN', 'MAX'),
-                       help="Delay range between requests in seconds (default: 1 3)")
+                       help="Delay range between requests in seconds; the adaptive rate limiter "
+                            "speeds up towards MIN and backs off towards MAX (default: 1 3)")
     parser.add_argument('--max-pages', type=int, 
                        help="Maximum number of pages to scrape")
     parser.add_argument('--timeout', type=int, default=10, 
                        help="Request timeout in seconds (default: 10)")
     parser.add_argument('--max-retries', type=int, default=3, 
                        help="Maximum retry attempts (default: 3)")
+    parser.add_argument('--http2', action='store_true',
+                       help="Use HTTP/2 via httpx (requires httpx[http2])")
+    parser.add_argument('--cache-dir',
+                       help="Directory to cache raw review pages in, so repeated runs skip the network")
     
     args = parser.parse_args()
     
     try:
         # Create scraper instance
-        scraper = GoogleMapsReviewScraper(
+        with GoogleMapsReviewScraper(
             delay_range=tuple(args.delay),
             max_retries=args.max_retries,
-            timeout=args.timeout
-        )
-        
-        # Scrape reviews
-        reviews = scraper.scrape_all_reviews(
-            place_url=args.url,
-            tripadvisor_only=args.tripadvisor,
-            max_pages=args.max_pages
-        )
-        
-        # Save results
-        scraper.save_reviews(reviews, args.output)
+            timeout=args.timeout,
+            http2=args.http2,
+            cache_dir=args.cache_dir
+        ) as scraper:
+            if args.output.endswith(".jsonl"):
+                # Stream reviews to disk as they are scraped
+                with scraper.save_reviews_stream(args.output) as sink:
+                    scraper.scrape_all_reviews(
+                        place_url=args.url,
+                        tripadvisor_only=args.tripadvisor,
+                        max_pages=args.max_pages,
+                        sink=sink
+                    )
+            else:
+                # Scrape reviews
+                reviews = scraper.scrape_all_reviews(
+                    place_url=args.url,
+                    tripadvisor_only=args.tripadvisor,
+                    max_pages=args.max_pages
+                )
+            
+                # Save results
+                scraper.save_reviews(reviews, args.output)
         
     except KeyboardInterrupt:
         print("\n⚠️ Scraping interrupted by user")